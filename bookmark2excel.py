@@ -6,8 +6,8 @@ Description:
     The program executes the following numbered steps:
       1. Open a file dialog for the user to select the HTML bookmarks file.
       2. Parse the selected HTML file with BeautifulSoup to extract bookmark and folder data.
-      3. Present a GUI to allow the user to select specific bookmark folders for processing.
-      4. Process and extract bookmark details (title, URL, folder, date added) recursively from the HTML.
+      3. Process and extract bookmark details (title, URL, folder, date added) and folder names in one pass.
+      4. Present a GUI to allow the user to select specific bookmark folders for processing.
       5. Filter the bookmarks based on the user-selected folders.
       6. Split the folder paths into hierarchical levels (separate columns) for easier reporting.
       7. Optionally include the input file name as a column in the resulting output.
@@ -16,7 +16,7 @@ Description:
 
 Usage:
     - Ensure all required libraries are installed:
-          pip install beautifulsoup4 pandas xlsxwriter
+          pip install beautifulsoup4 lxml pandas xlsxwriter
     - Run the script using:
           python bookmark2excel.py
     - Adjust constants (e.g., DEFAULT_FOLDER, MAX_FOLDER_LEVELS, DATE_FORMAT) as needed.
@@ -28,18 +28,24 @@ License: GNU Affero General Public License v3 (AGPLv3)
 
 import tkinter as tk
 from tkinter import filedialog, messagebox
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
 import pandas as pd
+import gc
 import os
+import re
 import sys
+import time
 import xlsxwriter
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Set, Optional
 
 # Global configuration: constants used across the application.
 DEFAULT_FOLDER = "All Bookmarks"
 MAX_FOLDER_LEVELS = 10
-DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+SEARCH_DEBOUNCE_MS = 150  # Delay before the folder search refreshes the list while typing.
+DATE_FORMAT = "yyyy-mm-dd hh:mm:ss"  # Excel number format for the Date_Added column.
+MAX_TIMESTAMP = int(pd.Timestamp.max.timestamp())  # Latest add date (epoch seconds) pandas can represent.
+URL_SCHEMES = re.compile(r"(?:ftp|http)s?://|mailto:|file://")  # URLs written as Excel hyperlinks.
 
 class CancelException(Exception):
     """Custom exception to signal that processing has been canceled by the user."""
@@ -60,11 +66,19 @@ class BookmarkProcessor:
     """
     
     def __init__(self):
-        """Initializes the BookmarkProcessor and sets the cancellation flag."""
+        """
+        Initializes the BookmarkProcessor, the cancellation flag and the parsed-data caches.
+        
+        A single hidden Tk root is created here and shared by every dialog of the workflow,
+        instead of starting a new Tcl interpreter for each one.
+        """
         self.cancelled = False
+        self.folder_names = set()
+        self.bookmarks = {}
+        self.tk_root = tk.Tk()
+        self.tk_root.withdraw()
     
-    @staticmethod
-    def get_file_path() -> str:
+    def get_file_path(self) -> str:
         """
         Opens a file dialog for selection of the HTML bookmarks file.
         
@@ -74,20 +88,17 @@ class BookmarkProcessor:
         Exits:
             Exits the program if no file is selected.
         """
-        root = tk.Tk()
-        root.withdraw()
         file_path = filedialog.askopenfilename(
+            parent=self.tk_root,
             title="Select HTML Bookmarks File",
             filetypes=[("HTML Files", "*.html"), ("All Files", "*.*")]
         )
-        root.destroy()
         if not file_path:
             print("No file selected. Exiting.")
             sys.exit(1)
         return file_path
 
-    @staticmethod
-    def get_save_file_path(default_name: str = "bookmarks.xlsx") -> str:
+    def get_save_file_path(self, default_name: str = "bookmarks.xlsx") -> str:
         """
         Opens a file dialog to allow the user to specify where to save the output Excel file.
         
@@ -100,21 +111,19 @@ class BookmarkProcessor:
         Exits:
             Exits the program if no save location is selected.
         """
-        root = tk.Tk()
-        root.withdraw()
         save_file_path = filedialog.asksaveasfilename(
+            parent=self.tk_root,
             title="Save Bookmarks As",
             defaultextension=".xlsx",
             initialfile=default_name,
             filetypes=[("Excel files", "*.xlsx"), ("All Files", "*.*")]
         )
-        root.destroy()
         if not save_file_path:
             print("No save file chosen. Exiting.")
             sys.exit(1)
         return save_file_path
 
-    def select_folders_with_confirm(self, soup: BeautifulSoup) -> List[str]:
+    def select_folders_with_confirm(self) -> List[str]:
         """
         Displays a GUI to let the user select the bookmark folders to process.
         
@@ -123,15 +132,15 @@ class BookmarkProcessor:
           - Middle Panel: Contains buttons to add or remove folders.
           - Right Panel: Displays folders selected by the user.
         
-        Args:
-            soup (BeautifulSoup): The BeautifulSoup object of the parsed HTML bookmarks file.
+        The folder names are read from the cache filled by walk_bookmarks().
         
         Returns:
             List[str]: A list of folder names selected by the user.
+        
+        Raises:
+            CancelException: If the user cancels or closes the selection window.
         """
-        # Extract unique folder names from <h3> tags.
-        folder_names = {tag.text.strip() for tag in soup.find_all("h3") if tag.text.strip()}
-        available = sorted(folder_names)
+        available = sorted(self.folder_names)
         if DEFAULT_FOLDER not in available:
             available.insert(0, DEFAULT_FOLDER)
         else:
@@ -139,10 +148,10 @@ class BookmarkProcessor:
             available.sort(key=lambda x: (x != DEFAULT_FOLDER, x))
         
         # Create the selection window.
-        sel_root = tk.Tk()
+        sel_root = tk.Toplevel(self.tk_root)
         sel_root.title("Select Folders to Process")
         sel_root.geometry("750x500")
-        sel_root.protocol("WM_DELETE_WINDOW", lambda: self.on_window_close(sel_root))
+        sel_root.protocol("WM_DELETE_WINDOW", lambda: on_cancel())
         
         # Configure grid layout.
         sel_root.grid_columnconfigure(0, weight=1, uniform="panels")
@@ -219,11 +228,15 @@ class BookmarkProcessor:
             selected_result = list(selected_listbox.get(0, tk.END))
             if not selected_result:
                 selected_result = [DEFAULT_FOLDER]
+            cancel_pending_update()
             sel_root.destroy()
         def on_cancel():
-            self.cancelled = True
-            sel_root.destroy()
-            sys.exit(0)
+            cancel_pending_update()
+            self.on_window_close(sel_root)
+        def cancel_pending_update():
+            # The shared root outlives this window, so drop a search refresh that is still queued.
+            if pending_update is not None:
+                sel_root.after_cancel(pending_update)
         confirm_btn = tk.Button(bottom_frame, text="Confirm", width=15,
                                   command=on_confirm, default=tk.ACTIVE, font=('Arial', 10, 'bold'))
         confirm_btn.pack(side=tk.LEFT, padx=20)
@@ -232,83 +245,166 @@ class BookmarkProcessor:
         cancel_btn.pack(side=tk.RIGHT, padx=20)
         
         # Update available folders based on search.
-        def update_avail_listbox(*args):
+        available_lower = [folder.lower() for folder in available]
+        shown = []  # Indices into `available` currently listed, in listbox order.
+        last_query = None
+        pending_update = None
+        def update_avail_listbox():
+            nonlocal shown, last_query, pending_update
+            pending_update = None
             query = search_var.get().lower()
-            avail_listbox.delete(0, tk.END)
-            for folder in available:
-                if query in folder.lower():
-                    avail_listbox.insert(tk.END, folder)
-        search_var.trace("w", update_avail_listbox)
+            if last_query is not None and last_query in query:
+                # The search only narrowed: delete the runs of rows that no longer match, bottom-up so
+                # the remaining positions stay valid (this also keeps the selection of the other rows).
+                keep = [query in available_lower[i] for i in shown]
+                delete = avail_listbox.delete
+                pos = len(keep) - 1
+                while pos >= 0:
+                    if keep[pos]:
+                        pos -= 1
+                        continue
+                    end = pos
+                    while pos >= 0 and not keep[pos]:
+                        pos -= 1
+                    delete(pos + 1, end)
+                shown = [i for i, k in zip(shown, keep) if k]
+            else:
+                shown = [i for i, folder in enumerate(available_lower) if query in folder]
+                avail_listbox.delete(0, tk.END)
+                if shown:
+                    avail_listbox.insert(tk.END, *[available[i] for i in shown])
+            last_query = query
+        def on_search_change(*args):
+            # Debounce typing so a burst of keystrokes results in a single update.
+            nonlocal pending_update
+            if pending_update is not None:
+                sel_root.after_cancel(pending_update)
+            pending_update = sel_root.after(SEARCH_DEBOUNCE_MS, update_avail_listbox)
+        search_var.trace("w", on_search_change)
         update_avail_listbox()
         sel_root.bind("<Return>", lambda e: on_confirm())
-        sel_root.mainloop()
+        sel_root.wait_window()
+        # SystemExit raised inside a Tk callback does not escape wait_window(), so the
+        # cancellation is signalled through the flag and raised from here instead.
+        if self.cancelled:
+            raise CancelException("Processing cancelled by user.")
         
         return selected_result
 
     def on_window_close(self, window):
         """
-        Handles the closing of a window by setting the cancellation flag and exiting.
+        Handles the closing of a window by setting the cancellation flag and destroying it.
+        
+        The caller checks the flag once its wait on the window returns and raises CancelException.
         
         Args:
-            window (tk.Tk): The Tkinter window being closed.
+            window (tk.Toplevel): The Tkinter window being closed.
         """
         self.cancelled = True
         window.destroy()
-        sys.exit(0)
 
-    def process_bookmarks(
-        self, elements: List, parent_folder: str = "", bookmarks: Optional[Dict] = None
-    ) -> List[Tuple]:
+    def walk_bookmarks(self, soup: BeautifulSoup):
+        """
+        Walks the parsed HTML once, caching both the folder names and the bookmark data.
+        
+        Args:
+            soup (BeautifulSoup): The BeautifulSoup object of the parsed HTML bookmarks file.
+        """
+        self.folder_names = set()
+        self.bookmarks = self.process_bookmarks(soup, self.folder_names)
+
+    def process_bookmarks(self, soup: BeautifulSoup, folder_names: Optional[Set[str]] = None) -> Dict[str, List]:
         """
-        Recursively processes HTML elements to extract bookmark data.
+        Iteratively walks the parsed HTML tree to extract bookmark data.
         
-        The function visits each HTML element in the provided list, extracting:
+        Every node is visited exactly once, in document order, using an explicit stack instead of
+        recursion. The walk extracts:
           - The bookmark title from anchor (<a>) elements.
           - The bookmark URL.
-          - The folder structure (built recursively from <h3> tags).
-          - The date the bookmark was added (formatted according to DATE_FORMAT).
+          - The folder structure (each <DL> belongs to the <h3> that precedes it).
+          - The date the bookmark was added (raw epoch seconds, or None if missing or invalid).
         
         Args:
-            elements (List): A list of BeautifulSoup elements to be processed.
-            parent_folder (str): The current folder path (used for recursive calls).
-            bookmarks (Optional[Dict]): Internal dictionary used during recursion to avoid duplicates.
+            soup (BeautifulSoup): The BeautifulSoup object of the parsed HTML bookmarks file.
+            folder_names (Optional[Set[str]]): If given, collects the names of all folders visited.
         
         Returns:
-            List[Tuple]: A list of tuples in the format (Bookmark, URL, Folder, Date_Added).
+            Dict[str, List]: Parallel column lists keyed by Bookmark, URL, Folder and Date_Added.
         """
-        if bookmarks is None:
-            bookmarks = {}
-        for item in elements:
-            if self.cancelled:
-                raise CancelException("Processing cancelled by user.")
-            if item.name == 'a':
-                href = item.get('href', '')
-                if href and href not in bookmarks:
-                    date_added = item.get('add_date', '')
+        titles, urls, folders, dates = [], [], [], []
+        seen = set()
+        # lxml closes the <DT> before the folder's <DL>, so the list is not always a sibling
+        # of its <h3>; it is the next <DL> in document order, hence the pending folder. It is kept
+        # as (parent path, name) and dropped at the next <a>, <h3> or <DL>, so a folder without a
+        # list of its own can never claim a later folder's list.
+        pending_folder = None
+        # Every bookmark of a folder shares its path string; the cache also reuses it for folders
+        # that appear more than once under the same parent.
+        path_cache = {}
+        stack = [(soup, "")]
+        while stack:
+            item, parent_folder = stack.pop()
+            name = item.name
+            if name == 'a':
+                pending_folder = None
+                attrs = item.attrs
+                href = attrs.get('href', '')
+                if href and href not in seen:
+                    seen.add(href)
+                    date_added = attrs.get('add_date', '')
                     try:
-                        if date_added:
-                            timestamp = int(date_added)
-                            if timestamp > 0:
-                                date_str = datetime.fromtimestamp(timestamp).strftime(DATE_FORMAT)
-                            else:
-                                date_str = ''
-                        else:
-                            date_str = ''
+                        timestamp = int(date_added) if date_added else None
+                        if timestamp is not None and not 0 < timestamp <= MAX_TIMESTAMP:
+                            timestamp = None
                     except (ValueError, TypeError):
-                        date_str = ''
-                    bookmarks[href] = (
-                        item.text.strip(),
-                        href,
-                        parent_folder,
-                        date_str
-                    )
-            elif item.name == 'h3':
-                folder_name = item.text.strip().replace("/", "___")
-                dl_tag = item.find_next_sibling("dl")
-                if dl_tag:
-                    new_parent = f"{parent_folder}/{folder_name}" if parent_folder else folder_name
-                    self.process_bookmarks(dl_tag.find_all(["a", "h3"]), new_parent, bookmarks)
-        return list(bookmarks.values())
+                        timestamp = None
+                    # .string avoids concatenating the descendants for the common single-text case.
+                    title = item.string
+                    titles.append(title.strip() if title is not None else item.get_text().strip())
+                    urls.append(href)
+                    folders.append(parent_folder)
+                    dates.append(timestamp)
+            elif name == 'h3':
+                folder_name = item.string
+                folder_name = folder_name.strip() if folder_name is not None else item.get_text().strip()
+                if folder_names is not None and folder_name:
+                    folder_names.add(folder_name)
+                pending_folder = (parent_folder, folder_name.replace("/", "___"))
+            else:
+                if name == 'dl':
+                    if self.cancelled:
+                        raise CancelException("Processing cancelled by user.")
+                    # Only a <DL> in the same list as the pending <h3> belongs to it.
+                    if pending_folder is not None and pending_folder[0] == parent_folder:
+                        folder_path = path_cache.get(pending_folder)
+                        if folder_path is None:
+                            folder_name = pending_folder[1]
+                            folder_path = f"{parent_folder}/{folder_name}" if parent_folder else folder_name
+                            path_cache[pending_folder] = folder_path
+                        parent_folder = folder_path
+                    pending_folder = None
+                # Push child tags in reverse so they are popped in document order.
+                stack.extend((child, parent_folder) for child in reversed(item.contents) if child.name)
+        return {"Bookmark": titles, "URL": urls, "Folder": folders, "Date_Added": dates}
+
+    def convert_add_dates(self, seconds: pd.Series) -> pd.Series:
+        """
+        Converts the raw epoch seconds of the Date_Added column to local (naive) datetimes.
+        
+        The local UTC offset is looked up once per distinct timestamp, as datetime.fromtimestamp
+        would, and the conversion itself runs as a single vectorized pandas operation.
+        
+        Args:
+            seconds (pd.Series): Epoch seconds, with None for missing dates.
+        
+        Returns:
+            pd.Series: The local datetimes, with NaT for missing dates.
+        """
+        # Casting to float64 first (None -> NaN) keeps pandas on its numeric paths.
+        seconds = seconds.astype("float64")
+        unique = seconds.dropna().unique()
+        offsets = pd.Series([time.localtime(t).tm_gmtoff for t in unique], index=unique, dtype="float64")
+        return pd.to_datetime(seconds + seconds.map(offsets), unit='s', errors='coerce')
 
     def filter_bookmarks(self, df: pd.DataFrame, selected_folders: List[str]) -> pd.DataFrame:
         """
@@ -327,17 +423,22 @@ class BookmarkProcessor:
         if DEFAULT_FOLDER in [s.strip() for s in selected_folders]:
             return df
         selected_set = {s.strip().lower() for s in selected_folders}
-        def is_in_selected(folder_path: str) -> bool:
-            if not folder_path:
-                return False
-            return any(part.lower() in selected_set for part in folder_path.split("/"))
-        return df[df["Folder"].apply(is_in_selected)]
+        if not selected_set:
+            return df.iloc[0:0]
+        # Match any whole path segment against the selected names in one vectorized regex scan.
+        # A "/" inside a folder name is stored as "___" in the path, so escape it the same way.
+        pattern = "(?:^|/)(?:" + "|".join(re.escape(s.replace("/", "___")) for s in selected_set) + ")(?:/|$)"
+        # Many bookmarks share a folder path, so only scan the distinct paths and map the result back.
+        folders = pd.Series(df["Folder"].unique())
+        matched = folders[folders.str.contains(pattern, case=False, regex=True, na=False)]
+        return df[df["Folder"].isin(matched)]
 
     def split_folder_levels(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Splits the folder path into separate hierarchical levels in the DataFrame.
         
         Each level is output to a new column (Level_1, Level_2, etc.), up to the maximum defined by MAX_FOLDER_LEVELS.
+        The Folder and level columns are returned with the category dtype.
         
         Args:
             df (pd.DataFrame): The DataFrame containing bookmark data.
@@ -345,10 +446,15 @@ class BookmarkProcessor:
         Returns:
             pd.DataFrame: The DataFrame updated to include separate columns for each folder level.
         """
-        folders_split = df['Folder'].str.split('/', expand=True)
-        num_columns = min(folders_split.shape[1], MAX_FOLDER_LEVELS)
-        for i in range(num_columns):
-            df[f"Level_{i+1}"] = folders_split[i].str.replace("___", "/")
+        # Cap the split at MAX_FOLDER_LEVELS; the extra column only holds the unused remainder.
+        folders_split = df['Folder'].str.split('/', n=MAX_FOLDER_LEVELS, expand=True).iloc[:, :MAX_FOLDER_LEVELS]
+        # Restore the "/" escaped inside folder names once, after splitting on the real separators.
+        folders_split = folders_split.replace("___", "/", regex=True)
+        folders_split.columns = [f"Level_{i+1}" for i in range(folders_split.shape[1])]
+        df = pd.concat([df, folders_split], axis=1)
+        # Few distinct paths and level names repeat over many rows; categories store each value once.
+        level_columns = ["Folder"] + list(folders_split.columns)
+        df[level_columns] = df[level_columns].astype("category")
         return df
 
     def ask_store_input_filename(self, file_path: str) -> bool:
@@ -361,13 +467,11 @@ class BookmarkProcessor:
         Returns:
             bool: True if the user wants to include the file name, otherwise False.
         """
-        root = tk.Tk()
-        root.withdraw()
         response = messagebox.askyesno(
             "Store Input File Name",
-            "Do you want to store the input file's name as the first column in the output?"
+            "Do you want to store the input file's name as the first column in the output?",
+            parent=self.tk_root
         )
-        root.destroy()
         return response
 
     def save_to_excel(self, df: pd.DataFrame, excel_path: str):
@@ -375,21 +479,21 @@ class BookmarkProcessor:
         Saves the processed bookmark DataFrame to an Excel file with proper formatting.
         
         The method sets column widths and applies specific formats (for URLs and dates) to the Excel worksheet.
+        Cells are written directly with xlsxwriter, row by row, rather than through DataFrame.to_excel.
         
         Args:
             df (pd.DataFrame): The DataFrame containing bookmark data.
             excel_path (str): The destination file path for the Excel workbook.
         """
-        # Convert the Date_Added column to datetime objects.
-        df['Date_Added'] = pd.to_datetime(df['Date_Added'], errors='coerce', format=DATE_FORMAT)
-        writer = pd.ExcelWriter(excel_path, engine='xlsxwriter')
-        df.to_excel(writer, index=False, sheet_name='Bookmarks')
-        workbook = writer.book
-        worksheet = writer.sheets['Bookmarks']
+        # constant_memory flushes each row to disk once the next one starts, so memory stays flat for
+        # large exports. It requires writing rows in order, which the loop below does.
+        workbook = xlsxwriter.Workbook(excel_path, {'constant_memory': True})
+        worksheet = workbook.add_worksheet('Bookmarks')
 
-        # Define Excel cell formats for URLs and dates.
+        # Define Excel cell formats for the header, URLs and dates.
+        header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
         url_format = workbook.add_format({'font_color': 'blue', 'underline': 1})
-        date_format = workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm:ss'})
+        date_format = workbook.add_format({'num_format': DATE_FORMAT})
 
         # Apply formatting based on column names.
         column_settings = [
@@ -404,9 +508,34 @@ class BookmarkProcessor:
                     worksheet.set_column(idx, idx, width, fmt)
                     break
             else:
-                max_len = max(df[col].astype(str).map(len).max(), len(col)) + 2
+                lengths = df[col].astype("string").str.len()
+                max_len = max(int(lengths.max()) if lengths.count() else 0, len(col)) + 2
                 worksheet.set_column(idx, idx, max_len)
-        writer.close()
+
+        def write_url(row: int, col: int, url: str, fmt):
+            # Only link the schemes Excel understands; fall back to text if xlsxwriter rejects the link.
+            if not URL_SCHEMES.match(url) or worksheet.write_url(row, col, url, fmt) < 0:
+                worksheet.write_string(row, col, url, fmt)
+
+        # Pick the writer and format for each column once, then write the rows left to right.
+        cell_writers = []
+        for col in df.columns:
+            if col == "URL":
+                cell_writers.append((write_url, url_format))
+            elif col == "Date_Added":
+                cell_writers.append((worksheet.write_datetime, date_format))
+            else:
+                cell_writers.append((worksheet.write_string, None))
+        worksheet.write_row(0, 0, list(df.columns), header_format)
+        for row, values in enumerate(df.itertuples(index=False, name=None), start=1):
+            for col, value in enumerate(values):
+                # Leave missing values (None, NaN, NaT) and empty strings, e.g. untitled bookmarks, as
+                # empty cells instead of writing zero-length strings, as DataFrame.to_excel did.
+                if value is None or value != value or value == "":
+                    continue
+                write, fmt = cell_writers[col]
+                write(row, col, value, fmt)
+        workbook.close()
 
     def show_summary(self, num_imported: int, output_path: str):
         """
@@ -416,7 +545,7 @@ class BookmarkProcessor:
             num_imported (int): The total number of bookmarks processed.
             output_path (str): The file path where the Excel file was saved.
         """
-        summary_root = tk.Tk()
+        summary_root = tk.Toplevel(self.tk_root)
         summary_root.title("Processing Complete")
         message = (
             f"Processing complete!\n\n"
@@ -427,7 +556,7 @@ class BookmarkProcessor:
                  font=('Arial', 11), justify=tk.LEFT).pack()
         tk.Button(summary_root, text="OK", command=summary_root.destroy,
                   width=15, font=('Arial', 10)).pack(pady=10)
-        summary_root.mainloop()
+        summary_root.wait_window()
 
     def run(self):
         """
@@ -436,8 +565,8 @@ class BookmarkProcessor:
         The method follows these steps:
           1. Prompt the user to select the input HTML file.
           2. Parse the HTML file.
-          3. Display a GUI to let the user choose bookmark folders.
-          4. Process the bookmarks from the parsed HTML.
+          3. Process the bookmarks and folders from the parsed HTML.
+          4. Display a GUI to let the user choose bookmark folders.
           5. Filter and reorganize the bookmark data.
           6. Optionally add the input file name as a column.
           7. Save the processed data to an Excel file.
@@ -447,17 +576,29 @@ class BookmarkProcessor:
             # Step 1: Get the HTML file from the user.
             file_path = self.get_file_path()
 
-            # Step 2: Parse the HTML file using BeautifulSoup.
-            with open(file_path, "r", encoding="utf-8") as f:
-                soup = BeautifulSoup(f.read(), 'html.parser')
+            # Step 2: Parse the HTML file using BeautifulSoup (lxml if available).
+            # Only the bookmark lists are kept; <DL> is needed for the folder structure.
+            strainer = SoupStrainer(["dl", "h3", "a"])
+            with open(file_path, "rb") as f:
+                try:
+                    soup = BeautifulSoup(f, 'lxml', from_encoding="utf-8", parse_only=strainer)
+                except FeatureNotFound:
+                    soup = BeautifulSoup(f, 'html.parser', from_encoding="utf-8", parse_only=strainer)
 
-            # Step 3: Ask the user to select which bookmark folders to process.
-            selected_folders = self.select_folders_with_confirm(soup)
-            print("Selected folders:", selected_folders)
+            # Step 3: Extract folders and bookmarks in a single pass over the tree.
+            self.walk_bookmarks(soup)
+            # The parse tree is no longer needed; it is full of parent/child reference cycles,
+            # so collect it now rather than keeping it alive through the DataFrame and Excel steps.
+            del soup
+            gc.collect()
 
-            # Step 4: Process the bookmarks (recursive extraction).
-            all_bookmarks = self.process_bookmarks(soup.find_all(["a", "h3"]))
-            df = pd.DataFrame(all_bookmarks, columns=["Bookmark", "URL", "Folder", "Date_Added"])
+            # Step 4: Ask the user to select which bookmark folders to process.
+            selected_folders = self.select_folders_with_confirm()
+            print("Selected folders:", selected_folders)
+            # Keep the text columns as object even when there are no bookmarks; empty lists would
+            # otherwise become float64 columns without a .str accessor.
+            df = pd.DataFrame(self.bookmarks).astype({"Bookmark": object, "URL": object, "Folder": object})
+            df["Date_Added"] = self.convert_add_dates(df["Date_Added"])
 
             # Step 5: Filter the bookmarks based on the selected folders.
             df = self.filter_bookmarks(df, selected_folders)
@@ -479,8 +620,10 @@ class BookmarkProcessor:
             print("Processing cancelled by user.")
             sys.exit(0)
         except Exception as e:
-            messagebox.showerror("Error", f"An error occurred:\n{str(e)}")
+            messagebox.showerror("Error", f"An error occurred:\n{str(e)}", parent=self.tk_root)
             sys.exit(1)
+        finally:
+            self.tk_root.destroy()
 
 # Entry point: This is where the script is executed.
 if __name__ == "__main__":